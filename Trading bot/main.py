@@ -7,7 +7,6 @@ Instead, just press the run button in the IDE.
 import os
 import sys
 import subprocess
-from ui.dashboard import create_streamlit_app
 
 
 def main():
@@ -50,6 +49,10 @@ def main():
         subprocess.run([sys.executable, "-m", "streamlit", "run", script_path])
         return
 
+    # Import here so the launcher process above exits without paying for
+    # the pandas/streamlit/plotly import chain it never uses
+    from ui.dashboard import create_streamlit_app
+
     # Create and display the Streamlit app
     create_streamlit_app()
 
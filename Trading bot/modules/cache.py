@@ -0,0 +1,127 @@
+"""
+Persistent API Response Cache
+-----------------------------
+This module provides a small on-disk TTL cache for external API responses
+(Twelve Data quotes, NewsAPI headlines). Streamlit's `st.cache_data` only
+lives in process memory, so every dashboard restart re-hits the rate-limited
+APIs; this cache survives restarts and lets warm starts skip the network
+entirely.
+
+Key features:
+1. JSON blobs stored under `.cache/{endpoint}/{md5(params)}.json`
+2. Each blob records its write timestamp, checked against a caller-supplied TTL
+3. Corrupt or unreadable cache files are treated as misses, never as errors
+"""
+
+import hashlib
+import json
+import os
+import time
+
+
+def df_fingerprint(df):
+    """
+    Cheap O(1) cache-key fingerprint for a time-series DataFrame
+
+    Streamlit's default DataFrame hashing touches every value; for this
+    dashboard's frames the row count plus boundary timestamps and last
+    close uniquely identify a payload, so st.cache_data wrappers pass
+    this via `hash_funcs={pd.DataFrame: df_fingerprint}` instead.
+
+    Duck-typed on purpose — it only uses len/columns/iat — so this module
+    stays importable without pandas.
+
+    Tests:
+        >>> df_fingerprint([])
+        (0,)
+    """
+    if not len(df):
+        return (0,)
+    cols = df.columns
+    first_ts = str(df['datetime'].iat[0]) if 'datetime' in cols else None
+    last_ts = str(df['datetime'].iat[-1]) if 'datetime' in cols else None
+    last_close = float(df['close'].iat[-1]) if 'close' in cols else None
+    return (len(df), first_ts, last_ts, last_close)
+
+
+class FileCache:
+    """
+    On-disk key/value cache with per-read TTL expiry
+
+    Entries are keyed by an endpoint name plus a params dict; the params are
+    hashed so arbitrary query combinations map to stable file names.
+
+    Tests:
+        >>> import tempfile
+        >>> cache = FileCache(tempfile.mkdtemp())
+        >>> cache.get('quotes', {'symbol': 'SPY'}, ttl=60) is None
+        True
+        >>> cache.set('quotes', {'symbol': 'SPY'}, [1, 2, 3])
+        >>> cache.get('quotes', {'symbol': 'SPY'}, ttl=60)
+        [1, 2, 3]
+        >>> # An expired entry behaves like a miss
+        >>> cache.get('quotes', {'symbol': 'SPY'}, ttl=-1) is None
+        True
+        >>> # Clearing an endpoint drops its entries
+        >>> cache.clear('quotes')
+        >>> cache.get('quotes', {'symbol': 'SPY'}, ttl=60) is None
+        True
+    """
+
+    def __init__(self, cache_dir=None):
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), ".cache")
+        self.cache_dir = cache_dir
+
+    def _path(self, endpoint, params):
+        key = hashlib.md5(
+            json.dumps(params, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        return os.path.join(self.cache_dir, endpoint, f"{key}.json")
+
+    def get(self, endpoint, params, ttl):
+        """
+        Return the cached value for (endpoint, params), or None if the entry
+        is missing, unreadable, or older than `ttl` seconds
+        """
+        try:
+            with open(self._path(endpoint, params)) as f:
+                blob = json.load(f)
+            if time.time() - blob["ts"] <= ttl:
+                return blob["data"]
+        except (OSError, ValueError, KeyError):
+            pass
+        return None
+
+    def clear(self, endpoint):
+        """
+        Delete every cached entry for an endpoint
+
+        Lets manual-refresh paths bypass the TTL; a missing directory or a
+        racing delete is not an error.
+        """
+        directory = os.path.join(self.cache_dir, endpoint)
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return
+        for name in names:
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+    def set(self, endpoint, params, data):
+        """
+        Store a JSON-serializable value for (endpoint, params)
+
+        Write failures are swallowed — a broken cache must never take the
+        dashboard down.
+        """
+        path = self._path(endpoint, params)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                json.dump({"ts": time.time(), "data": data}, f)
+        except (OSError, TypeError):
+            pass
@@ -9,19 +9,36 @@ from the Twelve Data API for use in Streamlit dashboards and analytical tools.
 
 Key features:
 1. fetch_time_series – retrieves historical OHLCV data for a given symbol, interval, and output size
-2. get_latest_close – extracts the most recent closing price from fetched data
-3. convert_to_dataframe – transforms the raw API JSON into a cleaner pandas DataFrame
-4. calculate_normalized_data – computes base‑100 normalized price series for comparative analysis
+2. fetch_many – fetches several symbols concurrently through a thread pool
+3. get_latest_close – extracts the most recent closing price from fetched data
+4. convert_to_dataframe – transforms the raw API JSON into a cleaner pandas DataFrame
+5. calculate_normalized_data – computes base‑100 normalized price series for comparative analysis
 """
 
-import requests
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
 import pandas as pd
 import streamlit as st
+from modules import http
+from modules.cache import FileCache, df_fingerprint
 from config import TWELVE_DATA_API_KEY
 
+_CACHE = FileCache()
+
+# On-disk TTL per interval: intraday quotes go stale quickly, daily bars do not
+_CACHE_TTLS = {
+    '1min': 60,
+    '5min': 300,
+    '15min': 900,
+    '30min': 1800,
+    '1h': 3600,
+    '1day': 86400,
+    '1week': 604800,
+}
 
 
-@st.cache_data(ttl=300)
+@st.cache_data(ttl=300, persist="disk", show_spinner=False, max_entries=256)
 def fetch_time_series(symbol, interval='1minute', outputsize=30):
     """
     Fetch time series data from Twelve Data API
@@ -40,17 +57,77 @@ def fetch_time_series(symbol, interval='1minute', outputsize=30):
         >>> print('OK') if result == [] else print('bad')
         OK
     """
+    cache_key = {'symbol': symbol, 'interval': interval, 'outputsize': outputsize}
+    cached = _CACHE.get('time_series', cache_key, _CACHE_TTLS.get(interval, 3600))
+    if cached is not None:
+        return cached
+
     url = (
         f"https://api.twelvedata.com/time_series?symbol={symbol}"
         f"&interval={interval}&outputsize={outputsize}&apikey={TWELVE_DATA_API_KEY}"
     )
     try:
-        data = requests.get(url).json()
-        return sorted(data['values'], key=lambda x: x['datetime']) if 'values' in data else []
+        # orjson consumes the raw bytes directly, skipping stdlib json's
+        # slower decode path
+        data = orjson.loads(http.get(url).content)
+        # Twelve Data returns values newest-first, so an in-place reverse
+        # yields oldest-first without an O(n log n) sort with a Python key
+        values = data.get('values', [])
+        values.reverse()
+        if values:
+            _CACHE.set('time_series', cache_key, values)
+        return values
     except Exception as e:
         st.error(f"Error fetching data for {symbol}: {e}")
         return []
 
+def clear_cached_time_series():
+    """Drop the on-disk time-series cache so the next fetch hits the API"""
+    _CACHE.clear('time_series')
+
+
+def fetch_many(symbols, interval='1minute', outputsize=30):
+    """
+    Fetch time series data for several symbols concurrently
+
+    Each symbol is an independent network call, so dispatching them through a
+    thread pool cuts total latency from the sum of the round trips to roughly
+    the slowest one. Connections are reused via the shared pooled session.
+
+    Args:
+        symbols (list): Stock symbols
+        interval (str): Time interval passed through to fetch_time_series
+        outputsize (int): Number of data points per symbol
+
+    Returns:
+        dict: Mapping of symbol to its time series data
+
+    Tests:
+        >>> # No symbols means no work and an empty mapping
+        >>> fetch_many([])
+        {}
+    """
+    if not symbols:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(8, len(symbols))) as executor:
+        results = executor.map(
+            lambda s: fetch_time_series(s, interval=interval, outputsize=outputsize),
+            symbols
+        )
+        return dict(zip(symbols, results))
+
+
+# Cheap O(1) cache-key fingerprint: a fetch payload is identified by its
+# length, boundary timestamps, and last close, so the cache never hashes
+# every row. The close field matters: SPY and GLD share identical bar
+# timestamps, so timestamps alone would collide across symbols.
+# DataFrame arguments use the shared df_fingerprint helper.
+def _rows_fingerprint(rows):
+    if not rows:
+        return (0,)
+    return (len(rows), rows[0]['datetime'], rows[-1]['datetime'], rows[-1].get('close'))
+
+
 def get_latest_close(data):
     """
     Get the latest closing price from time series data
@@ -72,6 +149,7 @@ def get_latest_close(data):
     """
     return float(data[-1]['close']) if data else None
 
+@st.cache_data(ttl=300, show_spinner=False, hash_funcs={list: _rows_fingerprint})
 def convert_to_dataframe(data):
     """
     Convert API data to pandas DataFrame
@@ -100,14 +178,34 @@ def convert_to_dataframe(data):
         return pd.DataFrame()
 
     df = pd.DataFrame(data)
-    df['datetime'] = pd.to_datetime(df['datetime'])
 
-    for col in ['open', 'high', 'low', 'close', 'volume']:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col])
+    # One astype call casts every numeric column in a single pass
+    numeric_cols = {
+        col: 'float64'
+        for col in ('open', 'high', 'low', 'close', 'volume')
+        if col in df.columns
+    }
+    if numeric_cols:
+        df = df.astype(numeric_cols, copy=False)
+
+    # Explicit format skips pandas' slow per-value format inference
+    df['datetime'] = pd.to_datetime(df['datetime'], format='ISO8601', cache=True)
 
     return df
 
+def _normalize(df):
+    """
+    Project a price frame down to datetime/close and add the base-100
+    'normalized' column, without deep-copying the full OHLCV payload
+    """
+    if df.empty:
+        return df.copy()
+    return df[['datetime', 'close']].assign(
+        normalized=lambda d: d['close'] / d['close'].iat[0] * 100.0
+    )
+
+
+@st.cache_data(ttl=300, show_spinner=False, hash_funcs={pd.DataFrame: df_fingerprint})
 def calculate_normalized_data(spy_df, gold_df):
     """
     Calculate normalized prices (base 100)
@@ -128,13 +226,4 @@ def calculate_normalized_data(spy_df, gold_df):
         >>> print('OK') if spy_n['normalized'][1] == 150.0 else print('bad')
         OK
     """
-    spy_normalized = spy_df.copy()
-    gold_normalized = gold_df.copy()
-
-    if not spy_df.empty:
-        spy_normalized['normalized'] = spy_normalized['close'] / spy_normalized['close'].iloc[0] * 100
-
-    if not gold_df.empty:
-        gold_normalized['normalized'] = gold_normalized['close'] / gold_normalized['close'].iloc[0] * 100
-
-    return spy_normalized, gold_normalized
+    return _normalize(spy_df), _normalize(gold_df)
@@ -15,26 +15,37 @@ Key features:
 which can serve as a leading indicator for market movements and inform investment decisions.
 """
 
+import orjson
 import requests
-from textblob import TextBlob
+from textblob.en.sentiments import PatternAnalyzer
+from modules import http
+from modules.cache import FileCache
 from datetime import datetime, timedelta
 from typing import Tuple, List, Dict
 from config import NEWS_API_KEY, BULLISH_THRESHOLD, BEARISH_THRESHOLD
 import streamlit as st
 
-NEWS_API_KEY = 'd4eeac3a7bf24bd1aaf6f0021b6342cc'
+# Shared analyzer so each headline skips TextBlob's per-instance
+# tokenizer/analyzer construction. The throwaway analyze() triggers the
+# lazy lexicon load at import, so the first user request doesn't stall
+# on warm-up.
+_ANALYZER = PatternAnalyzer()
+_ANALYZER.analyze("warmup")
 
-# Trading parameters
-PROFIT_TAKING = 11.75
-STOP_LOSS = 2.25
-CASH_ALLOCATION = 0.2
+_CACHE = FileCache()
 
-# Sentiment thresholds
-BULLISH_THRESHOLD = 0.05
-BEARISH_THRESHOLD = 0.3
+# On-disk TTLs: current sentiment must stay fresh, historical never changes
+_CURRENT_TTL = 300
+_HISTORICAL_TTL = 604800
 
 
 
+def clear_cached_sentiment() -> None:
+    """Drop the on-disk current-sentiment cache so the next call refetches"""
+    _CACHE.clear("news_current")
+
+
+@st.cache_data(ttl=300, show_spinner=False)
 def get_current_market_sentiment(asset: str = None) -> Tuple[float, str, List[Dict]]:
     """
     Fetch market sentiment based on business or asset-specific news headlines.
@@ -54,6 +65,12 @@ def get_current_market_sentiment(asset: str = None) -> Tuple[float, str, List[Di
         >>> print('OK') if avg == 0.0 and summary == " No news available" and details == [] else print('bad')
         OK
     """
+    cache_key = {"asset": asset or "top-business"}
+    cached = _CACHE.get("news_current", cache_key, _CURRENT_TTL)
+    if cached is not None:
+        avg, summary, details = cached
+        return avg, summary, details
+
     base = "https://newsapi.org/v2"
     if asset:
         url = f"{base}/everything"
@@ -75,25 +92,30 @@ def get_current_market_sentiment(asset: str = None) -> Tuple[float, str, List[Di
             "apiKey": NEWS_API_KEY,
         }
 
-    resp = requests.get(url, params=params)
-    resp.raise_for_status()
-    data = resp.json().get("articles", [])
+    try:
+        resp = http.get(url, params=params)
+        resp.raise_for_status()
+        data = orjson.loads(resp.content).get("articles", [])
+    except requests.RequestException as e:
+        # Missing/invalid API key or a network failure must degrade the
+        # dashboard, not take it down
+        st.error(f"Network error fetching market sentiment: {e}")
+        return 0.0, " Error", []
 
     if not data:
         return 0.0, " No news available", []
 
-    scores = []
-    details = []
-    for art in data:
-        title = art.get("title", "")
-        polarity = TextBlob(title).sentiment.polarity
-        scores.append(polarity)
-        details.append({
+    titles = [art.get("title", "") for art in data]
+    scores = [_ANALYZER.analyze(title).polarity for title in titles]
+    details = [
+        {
             "title": title,
             "url":   art.get("url", ""),
             "source": art.get("source", {}).get("name", "Unknown"),
             "sentiment": polarity,
-        })
+        }
+        for art, title, polarity in zip(data, titles, scores)
+    ]
 
     avg = sum(scores) / len(scores)
     if avg > BULLISH_THRESHOLD:
@@ -103,6 +125,7 @@ def get_current_market_sentiment(asset: str = None) -> Tuple[float, str, List[Di
     else:
         sum_of_sentiment = " Neutral"
 
+    _CACHE.set("news_current", cache_key, [avg, sum_of_sentiment, details])
     return avg, sum_of_sentiment, details
 
 
@@ -124,6 +147,12 @@ def historical_market_sentiment(date: str, asset: str) -> Tuple[float, str, List
         >>> print('OK') if result == (0, " No articles found for that date/asset.", []) else print('bad')
         OK
     """
+    cache_key = {"asset": asset, "date": date}
+    cached = _CACHE.get("news_historical", cache_key, _HISTORICAL_TTL)
+    if cached is not None:
+        avg_score, summary, article_details = cached
+        return avg_score, summary, article_details
+
     # Build NewsAPI query for that single day
     url = (
         "https://newsapi.org/v2/everything"
@@ -135,27 +164,26 @@ def historical_market_sentiment(date: str, asset: str) -> Tuple[float, str, List
     )
 
     try:
-        response = requests.get(url)
+        response = http.get(url)
         response.raise_for_status()
-        articles = response.json().get("articles", [])
+        articles = orjson.loads(response.content).get("articles", [])
 
         if not articles:
             return 0, " No articles found for that date/asset.", []
 
-        scores = []
-        article_details = []
-
         # limit to first 10 to keep parity with current function
-        for article in articles[:10]:
-            title = article.get("title", "")
-            polarity = TextBlob(title).sentiment.polarity
-            scores.append(polarity)
-            article_details.append({
+        articles = articles[:10]
+        titles = [article.get("title", "") for article in articles]
+        scores = [_ANALYZER.analyze(title).polarity for title in titles]
+        article_details = [
+            {
                 "title": title,
                 "url": article.get("url", ""),
                 "source": article.get("source", {}).get("name", "Unknown"),
                 "sentiment": polarity
-            })
+            }
+            for article, title, polarity in zip(articles, titles, scores)
+        ]
 
         avg_score = sum(scores) / len(scores)
 
@@ -166,6 +194,7 @@ def historical_market_sentiment(date: str, asset: str) -> Tuple[float, str, List
         else:
             summary = " Neutral"
 
+        _CACHE.set("news_historical", cache_key, [avg_score, summary, article_details])
         return avg_score, summary, article_details
 
     except requests.RequestException as e:
@@ -1,190 +1,307 @@
-"""
-Sentiment Strategy Backtest
----------------------------
-
-This module simulates and evaluates a sentiment‑driven trading strategy on SPY and GLD
-using synthetic alternating sentiment signals over a 5‑day cycle. It allocates capital
-with reserved cash buffers, executes buy/sell decisions based on bullish and bearish
-thresholds, applies take‑profit and stop‑loss rules, and tracks both portfolio value
-over time and detailed transaction history.
-
-Key features:
-1. Alternating sentiment simulation for SPY and GLD
-2. Automatic take‑profit and stop‑loss execution
-3. Buy and sell signals triggered by configurable sentiment thresholds
-4. Capital allocation with reserved buffers for each asset
-5. Generation of portfolio value time series and comprehensive transaction logs
-
-"""
-
-def sentiment_strategy_backtest(
-    spy_df,
-    gld_df,
-    initial_portfolio=10000,
-    take_profit=0.1175,
-    stop_loss=0.0225,
-    bullish_threshold=0.05,
-    bearish_threshold=-0.3
-):
-    """
-    Args:
-        spy_df (DataFrame): SPY price data with 'datetime' and 'close' columns.
-        gld_df (DataFrame): GLD price data with 'datetime' and 'close' columns.
-        initial_portfolio (float): Starting capital for the backtest.
-        take_profit (float): Profit-taking threshold ratio (e.g., 0.09 for 9%).
-        stop_loss (float): Stop-loss threshold ratio (e.g., 0.05 for 5%).
-        bullish_threshold (float): Sentiment value above which to enter long.
-        bearish_threshold (float): Sentiment value below which to exit/short.
-
-    Returns:
-        tuple:
-            - list[datetime]: Timestamps of each data point processed.
-            - list[float]: Total portfolio value at each timestamp.
-            - list[dict]: Transaction records.
-
-    Tests:
-        >>> import pandas as pd
-        >>> from datetime import datetime
-        >>> # 1) Empty inputs should yield empty outputs
-        >>> empty = pd.DataFrame(columns=['datetime', 'close'])
-        >>> times, values, txs = sentiment_strategy_backtest(empty, empty)
-        >>> print('OK') if times == [] and values == [] and txs == [] else print('bad')
-        OK
-
-        >>> # 2) Single date, price so high no shares can be bought -> no trades, flat value
-        >>> df = pd.DataFrame({
-        ...     'datetime': [datetime(2025, 4, 23)],
-        ...     'close': [10000.0]
-        ... })
-        >>> times, values, txs = sentiment_strategy_backtest(df, df, initial_portfolio=10000)
-        >>> print('OK') if times == [datetime(2025, 4, 23)] else print('bad')
-        OK
-        >>> print('OK') if values == [10000.0] else print('bad')
-        OK
-        >>> print('OK') if txs == [] else print('bad')
-        OK
-    """
-    # Capital allocation and holdings
-    results = []
-    transactions = []
-
-    half = initial_portfolio / 2
-    spy_cash = half - 100
-    gld_cash = half - 100
-    spy_reserved = 100
-    gld_reserved = 100
-
-    spy_shares, spy_entry = 0, None
-    gld_shares, gld_entry = 0, None
-
-    # Merge on datetime
-    df = (
-        spy_df.set_index('datetime')['close'].to_frame('spy')
-        .join(gld_df.set_index('datetime')['close'].to_frame('gld'), how='inner')
-        .reset_index()
-    )
-
-    # Early exit if no data
-    if df.empty:
-        return [], [], []
-
-    # Simulated alternating sentiment
-    dates = df['datetime'].dt.strftime('%Y-%m-%d').tolist()
-    sentiment_spy = {}
-    sentiment_gld = {}
-    for i, d in enumerate(sorted(set(dates))):
-        cycle = i % 5
-        sentiment_spy[d] = -0.2 if cycle < 2 else (0.2 if cycle < 4 else 0.0)
-        sentiment_gld[d] = 0.2 if cycle < 2 else (-0.2 if cycle < 4 else 0.0)
-
-    # Main loop
-    for row in df.itertuples(index=False):
-        date, spy_price, gld_price = row.datetime, row.spy, row.gld
-        key = date.strftime('%Y-%m-%d')
-        spy_sent = sentiment_spy.get(key, 0)
-        gld_sent = sentiment_gld.get(key, 0)
-
-        # Profit / stop‐loss checks for existing positions
-        if spy_shares > 0 and spy_entry is not None:
-            spy_ret = (spy_price - spy_entry) / spy_entry
-            if spy_ret >= take_profit or spy_ret <= -stop_loss:
-                action = 'Take Profit' if spy_ret >= take_profit else 'Stop Loss'
-                val = spy_shares * spy_price
-                spy_cash += val
-                transactions.append({
-                    'date': date, 'symbol': 'SPY', 'action': action,
-                    'shares': spy_shares, 'price': spy_price, 'value': val,
-                    'return_pct': spy_ret * 100
-                })
-                spy_shares = 0
-                spy_entry = None
-
-        if gld_shares > 0 and gld_entry is not None:
-            gld_ret = (gld_price - gld_entry) / gld_entry
-            if gld_ret >= take_profit or gld_ret <= -stop_loss:
-                action = 'Take Profit' if gld_ret >= take_profit else 'Stop Loss'
-                val = gld_shares * gld_price
-                gld_cash += val
-                transactions.append({
-                    'date': date, 'symbol': 'GLD', 'action': action,
-                    'shares': gld_shares, 'price': gld_price, 'value': val,
-                    'return_pct': gld_ret * 100
-                })
-                gld_shares = 0
-                gld_entry = None
-
-        # Entry / exit signals based on sentiment
-        if spy_sent > bullish_threshold and spy_shares == 0:
-            shares = int(spy_cash // spy_price)
-            if shares:
-                cost = shares * spy_price
-                spy_cash -= cost
-                spy_shares = shares
-                spy_entry = spy_price
-                transactions.append({
-                    'date': date, 'symbol': 'SPY', 'action': 'Buy',
-                    'shares': shares, 'price': spy_price, 'value': cost
-                })
-        elif spy_sent < bearish_threshold and spy_shares > 0:
-            proceeds = spy_shares * spy_price
-            pnl = (spy_price - spy_entry) / spy_entry * 100 if spy_entry else 0
-            spy_cash += proceeds
-            transactions.append({
-                'date': date, 'symbol': 'SPY', 'action': 'Sell',
-                'shares': spy_shares, 'price': spy_price, 'value': proceeds,
-                'return_pct': pnl
-            })
-            spy_shares = 0
-            spy_entry = None
-
-        if gld_sent > bullish_threshold and gld_shares == 0:
-            shares = int(gld_cash // gld_price)
-            if shares:
-                cost = shares * gld_price
-                gld_cash -= cost
-                gld_shares = shares
-                gld_entry = gld_price
-                transactions.append({
-                    'date': date, 'symbol': 'GLD', 'action': 'Buy',
-                    'shares': shares, 'price': gld_price, 'value': cost
-                })
-        elif gld_sent < bearish_threshold and gld_shares > 0:
-            proceeds = gld_shares * gld_price
-            pnl = (gld_price - gld_entry) / gld_entry * 100 if gld_entry else 0
-            gld_cash += proceeds
-            transactions.append({
-                'date': date, 'symbol': 'GLD', 'action': 'Sell',
-                'shares': gld_shares, 'price': gld_price, 'value': proceeds,
-                'return_pct': pnl
-            })
-            gld_shares = 0
-            gld_entry = None
-
-        # Record total value
-        total = (
-            spy_cash + spy_shares * spy_price + spy_reserved +
-            gld_cash + gld_shares * gld_price + gld_reserved
-        )
-        results.append({'date': date, 'value': total})
-
-    return df['datetime'].tolist(), [r['value'] for r in results], transactions
+"""
+Sentiment Strategy Backtest
+---------------------------
+
+This module simulates and evaluates a sentiment‑driven trading strategy on SPY and GLD
+using synthetic alternating sentiment signals over a 5‑day cycle. It allocates capital
+with reserved cash buffers, executes buy/sell decisions based on bullish and bearish
+thresholds, applies take‑profit and stop‑loss rules, and tracks both portfolio value
+over time and detailed transaction history.
+
+Key features:
+1. Alternating sentiment simulation for SPY and GLD
+2. Automatic take‑profit and stop‑loss execution
+3. Buy and sell signals triggered by configurable sentiment thresholds
+4. Capital allocation with reserved buffers for each asset
+5. Generation of portfolio value time series and comprehensive transaction logs
+
+The trading logic itself is a scalar state machine over price arrays, so it is
+compiled with Numba when available; without Numba the same function runs as
+plain Python with identical results.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional — fall back to the interpreted loop
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# The compiled core cannot build Python dicts/strings, so transactions come
+# back as coded arrays and are decoded through these tables
+_SYMBOL_NAMES = ('SPY', 'GLD')
+_SPY, _GLD = 0, 1
+_ACTION_NAMES = ('Buy', 'Sell', 'Take Profit', 'Stop Loss')
+_BUY, _SELL, _TAKE_PROFIT, _STOP_LOSS = 0, 1, 2, 3
+
+# Alternating 5-day sentiment cycle tables, indexed by day number mod 5
+_SPY_CYCLE = np.array([-0.2, -0.2, 0.2, 0.2, 0.0])
+_GLD_CYCLE = np.array([0.2, 0.2, -0.2, -0.2, 0.0])
+
+
+@njit(cache=True)
+def _run_backtest(
+    spy_prices, gld_prices, spy_sents, gld_sents,
+    take_profit, stop_loss, bullish_threshold, bearish_threshold,
+    spy_cash, gld_cash
+):
+    """
+    Numeric core of the backtest: pure float64/int64 state machine.
+
+    Returns the per-bar portfolio value array (excluding reserved buffers)
+    plus columnar transaction arrays truncated to the number of trades.
+    A negative entry price means "no open position".
+    """
+    n = spy_prices.shape[0]
+    values = np.empty(n, np.float64)
+
+    # Worst case is two transactions per asset per bar: a take-profit or
+    # stop-loss exit followed by an immediate sentiment re-buy in the same
+    # iteration. Sizing for that keeps the buffer safe for any caller's
+    # thresholds — njit compiles without bounds checks, so an undersized
+    # buffer would be a silent out-of-bounds write.
+    max_tx = 4 * n + 4
+    tx_idx = np.empty(max_tx, np.int64)
+    tx_sym = np.empty(max_tx, np.int8)
+    tx_action = np.empty(max_tx, np.int8)
+    tx_shares = np.empty(max_tx, np.int64)
+    tx_price = np.empty(max_tx, np.float64)
+    tx_value = np.empty(max_tx, np.float64)
+    tx_ret = np.full(max_tx, np.nan)
+    k = 0
+
+    spy_shares, spy_entry = 0, -1.0
+    gld_shares, gld_entry = 0, -1.0
+
+    for i in range(n):
+        spy_price = spy_prices[i]
+        gld_price = gld_prices[i]
+        spy_sent = spy_sents[i]
+        gld_sent = gld_sents[i]
+
+        # Profit / stop‐loss checks for existing positions
+        if spy_shares > 0 and spy_entry > 0.0:
+            spy_ret = (spy_price - spy_entry) / spy_entry
+            if spy_ret >= take_profit or spy_ret <= -stop_loss:
+                action = _TAKE_PROFIT if spy_ret >= take_profit else _STOP_LOSS
+                val = spy_shares * spy_price
+                spy_cash += val
+                tx_idx[k] = i
+                tx_sym[k] = _SPY
+                tx_action[k] = action
+                tx_shares[k] = spy_shares
+                tx_price[k] = spy_price
+                tx_value[k] = val
+                tx_ret[k] = spy_ret * 100
+                k += 1
+                spy_shares, spy_entry = 0, -1.0
+
+        if gld_shares > 0 and gld_entry > 0.0:
+            gld_ret = (gld_price - gld_entry) / gld_entry
+            if gld_ret >= take_profit or gld_ret <= -stop_loss:
+                action = _TAKE_PROFIT if gld_ret >= take_profit else _STOP_LOSS
+                val = gld_shares * gld_price
+                gld_cash += val
+                tx_idx[k] = i
+                tx_sym[k] = _GLD
+                tx_action[k] = action
+                tx_shares[k] = gld_shares
+                tx_price[k] = gld_price
+                tx_value[k] = val
+                tx_ret[k] = gld_ret * 100
+                k += 1
+                gld_shares, gld_entry = 0, -1.0
+
+        # Entry / exit signals based on sentiment
+        if spy_sent > bullish_threshold and spy_shares == 0:
+            shares = int(spy_cash // spy_price)
+            if shares:
+                cost = shares * spy_price
+                spy_cash -= cost
+                spy_shares = shares
+                spy_entry = spy_price
+                tx_idx[k] = i
+                tx_sym[k] = _SPY
+                tx_action[k] = _BUY
+                tx_shares[k] = shares
+                tx_price[k] = spy_price
+                tx_value[k] = cost
+                k += 1
+        elif spy_sent < bearish_threshold and spy_shares > 0:
+            proceeds = spy_shares * spy_price
+            pnl = (spy_price - spy_entry) / spy_entry * 100 if spy_entry > 0.0 else 0.0
+            spy_cash += proceeds
+            tx_idx[k] = i
+            tx_sym[k] = _SPY
+            tx_action[k] = _SELL
+            tx_shares[k] = spy_shares
+            tx_price[k] = spy_price
+            tx_value[k] = proceeds
+            tx_ret[k] = pnl
+            k += 1
+            spy_shares, spy_entry = 0, -1.0
+
+        if gld_sent > bullish_threshold and gld_shares == 0:
+            shares = int(gld_cash // gld_price)
+            if shares:
+                cost = shares * gld_price
+                gld_cash -= cost
+                gld_shares = shares
+                gld_entry = gld_price
+                tx_idx[k] = i
+                tx_sym[k] = _GLD
+                tx_action[k] = _BUY
+                tx_shares[k] = shares
+                tx_price[k] = gld_price
+                tx_value[k] = cost
+                k += 1
+        elif gld_sent < bearish_threshold and gld_shares > 0:
+            proceeds = gld_shares * gld_price
+            pnl = (gld_price - gld_entry) / gld_entry * 100 if gld_entry > 0.0 else 0.0
+            gld_cash += proceeds
+            tx_idx[k] = i
+            tx_sym[k] = _GLD
+            tx_action[k] = _SELL
+            tx_shares[k] = gld_shares
+            tx_price[k] = gld_price
+            tx_value[k] = proceeds
+            tx_ret[k] = pnl
+            k += 1
+            gld_shares, gld_entry = 0, -1.0
+
+        # Record total value (reserved buffers are added back by the caller)
+        values[i] = (
+            spy_cash + spy_shares * spy_price +
+            gld_cash + gld_shares * gld_price
+        )
+
+    return (
+        values,
+        tx_idx[:k], tx_sym[:k], tx_action[:k],
+        tx_shares[:k], tx_price[:k], tx_value[:k], tx_ret[:k],
+    )
+
+
+def sentiment_strategy_backtest(
+    spy_df,
+    gld_df,
+    initial_portfolio=10000,
+    take_profit=0.1175,
+    stop_loss=0.0225,
+    bullish_threshold=0.05,
+    bearish_threshold=-0.3
+):
+    """
+    Args:
+        spy_df (DataFrame): SPY price data with 'datetime' and 'close' columns.
+        gld_df (DataFrame): GLD price data with 'datetime' and 'close' columns.
+        initial_portfolio (float): Starting capital for the backtest.
+        take_profit (float): Profit-taking threshold ratio (e.g., 0.09 for 9%).
+        stop_loss (float): Stop-loss threshold ratio (e.g., 0.05 for 5%).
+        bullish_threshold (float): Sentiment value above which to enter long.
+        bearish_threshold (float): Sentiment value below which to exit/short.
+
+    Returns:
+        tuple:
+            - list[datetime]: Timestamps of each data point processed.
+            - list[float]: Total portfolio value at each timestamp.
+            - list[dict]: Transaction records.
+
+    Tests:
+        >>> import pandas as pd
+        >>> from datetime import datetime
+        >>> # 1) Empty inputs should yield empty outputs
+        >>> empty = pd.DataFrame(columns=['datetime', 'close'])
+        >>> times, values, txs = sentiment_strategy_backtest(empty, empty)
+        >>> print('OK') if times == [] and values == [] and txs == [] else print('bad')
+        OK
+
+        >>> # 2) Single date, price so high no shares can be bought -> no trades, flat value
+        >>> df = pd.DataFrame({
+        ...     'datetime': [datetime(2025, 4, 23)],
+        ...     'close': [10000.0]
+        ... })
+        >>> times, values, txs = sentiment_strategy_backtest(df, df, initial_portfolio=10000)
+        >>> print('OK') if times == [datetime(2025, 4, 23)] else print('bad')
+        OK
+        >>> print('OK') if values == [10000.0] else print('bad')
+        OK
+        >>> print('OK') if txs == [] else print('bad')
+        OK
+    """
+    # Capital allocation
+    half = initial_portfolio / 2
+    spy_cash = half - 100
+    gld_cash = half - 100
+    spy_reserved = 100
+    gld_reserved = 100
+
+    # Merge on datetime — a single column merge avoids the set_index /
+    # join / reset_index trio and its two index rebuilds
+    df = pd.merge(
+        spy_df[['datetime', 'close']].rename(columns={'close': 'spy'}),
+        gld_df[['datetime', 'close']].rename(columns={'close': 'gld'}),
+        on='datetime',
+        how='inner',
+        sort=True
+    )
+
+    # Early exit if no data
+    if df.empty:
+        return [], [], []
+
+    # Simulated alternating sentiment: the cycle is deterministic per day,
+    # so index the module-level pattern tables by day number
+    day_ids = pd.factorize(df['datetime'].dt.normalize())[0]
+    spy_sents = _SPY_CYCLE[day_ids % 5]
+    gld_sents = _GLD_CYCLE[day_ids % 5]
+
+    dates = df['datetime'].tolist()
+
+    values, tx_idx, tx_sym, tx_action, tx_shares, tx_price, tx_value, tx_ret = _run_backtest(
+        df['spy'].to_numpy(np.float64),
+        df['gld'].to_numpy(np.float64),
+        spy_sents,
+        gld_sents,
+        float(take_profit),
+        float(stop_loss),
+        float(bullish_threshold),
+        float(bearish_threshold),
+        float(spy_cash),
+        float(gld_cash),
+    )
+    values += spy_reserved + gld_reserved
+
+    # Decode the columnar transaction arrays back into the record format the
+    # dashboard expects; buys carry no 'return_pct' (NaN sentinel). Each
+    # column is converted to Python scalars in one tolist() pass instead of
+    # boxing numpy scalars element by element.
+    idxs = tx_idx.tolist()
+    syms = tx_sym.tolist()
+    actions = tx_action.tolist()
+    shares_col = tx_shares.tolist()
+    prices = tx_price.tolist()
+    tx_values = tx_value.tolist()
+    rets = tx_ret.tolist()
+
+    transactions = [None] * len(idxs)
+    for j in range(len(idxs)):
+        tx = {
+            'date': dates[idxs[j]],
+            'symbol': _SYMBOL_NAMES[syms[j]],
+            'action': _ACTION_NAMES[actions[j]],
+            'shares': shares_col[j],
+            'price': prices[j],
+            'value': tx_values[j],
+        }
+        if not math.isnan(rets[j]):
+            tx['return_pct'] = rets[j]
+        transactions[j] = tx
+
+    return dates, values.tolist(), transactions
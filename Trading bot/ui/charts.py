@@ -16,10 +16,20 @@ charts that help traders and analysts understand market trends, compare assets,
 and evaluate portfolio performance over time.
 """
 
+import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
+import streamlit as st
 
+from modules.cache import df_fingerprint
 
+# O(1) content fingerprinting so an unchanged frame hits the figure cache
+# even when the caller hands Streamlit a fresh object each rerun, without
+# hashing every row
+_HASH_FUNCS = {pd.DataFrame: df_fingerprint}
+
+
+@st.cache_data(ttl=60, show_spinner=False, hash_funcs=_HASH_FUNCS)
 def create_price_chart(df, title, height=400):
     """
     Create a price chart using Plotly
@@ -49,6 +59,7 @@ def create_price_chart(df, title, height=400):
     return fig
 
 
+@st.cache_data(ttl=60, show_spinner=False, hash_funcs=_HASH_FUNCS)
 def create_volume_chart(df, title, height=400):
     """
     Create a volume chart using Plotly
@@ -78,6 +89,7 @@ def create_volume_chart(df, title, height=400):
     return fig
 
 
+@st.cache_data(ttl=60, show_spinner=False, hash_funcs=_HASH_FUNCS)
 def create_normalized_chart(spy_normalized, gold_normalized, height=500):
     """
     Create a normalized comparison chart
@@ -103,28 +115,22 @@ def create_normalized_chart(spy_normalized, gold_normalized, height=500):
     """
     fig = go.Figure()
 
-    if not spy_normalized.empty:
-        fig.add_trace(
-            go.Scatter(
-                x=spy_normalized['datetime'],
-                y=spy_normalized['normalized'],
-                name="SPY"
-            )
-        )
-
-    if not gold_normalized.empty:
-        fig.add_trace(
-            go.Scatter(
-                x=gold_normalized['datetime'],
-                y=gold_normalized['normalized'],
-                name="GLD"
+    # Data-driven so adding an asset means adding a pair, not a new block
+    for df, name in ((spy_normalized, "SPY"), (gold_normalized, "GLD")):
+        if not df.empty:
+            fig.add_trace(
+                go.Scatter(
+                    x=df['datetime'],
+                    y=df['normalized'],
+                    name=name
+                )
             )
-        )
 
     fig.update_layout(title='Normalized Price (Base 100)', height=height)
     return fig
 
 
+@st.cache_data(ttl=60, show_spinner=False, hash_funcs=_HASH_FUNCS)
 def create_backtest_chart(spy_df, gold_df, backtest_returns, initial_portfolio, height=400):
     """
         Create a portfolio backtest comparison chart
@@ -161,9 +167,12 @@ def create_backtest_chart(spy_df, gold_df, backtest_returns, initial_portfolio,
         backtest_returns = backtest_returns[:n]
         dates = dates.iloc[:n]
 
-    # buy‐and‐hold benchmarks
-    spy_val  = initial_portfolio * (spy_df['close'] / spy_df['close'].iloc[0])
-    gold_val = initial_portfolio * (gold_df['close'] / gold_df['close'].iloc[0])
+    # buy‐and‐hold benchmarks — one contiguous ndarray multiply each,
+    # instead of chained Series ops allocating intermediates per render
+    spy_close = spy_df['close'].to_numpy()
+    gold_close = gold_df['close'].to_numpy()
+    spy_val = spy_close * (initial_portfolio / spy_close[0])
+    gold_val = gold_close * (initial_portfolio / gold_close[0])
 
     fig = go.Figure([
         go.Scatter(x=spy_df['datetime'], y=spy_val,         name="Buy-and-Hold SPY"),
@@ -179,6 +188,7 @@ def create_backtest_chart(spy_df, gold_df, backtest_returns, initial_portfolio,
     return fig
 
 
+@st.cache_data(ttl=60, show_spinner=False, hash_funcs=_HASH_FUNCS)
 def create_sentiment_gauge(sentiment_score, height=250):
     """
     Create sentiment gauge chart
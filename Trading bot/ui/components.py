@@ -16,8 +16,16 @@ Key features:
 These components enable a cohesive, interactive user experience by encapsulating
 common UI patterns—inputs, metrics, lists, and auto‑reload logic—in reusable functions.
 """
+import numpy as np
+import pandas as pd
 import streamlit as st
-from modules.market_data import get_latest_close
+from modules.market_data import get_latest_close, clear_cached_time_series
+from modules.sentiment import clear_cached_sentiment
+
+try:
+    from streamlit_autorefresh import st_autorefresh
+except ImportError:  # optional dependency — fall back to a JS page reload
+    st_autorefresh = None
 
 def display_sidebar_settings(on_refresh_callback=None):
     """
@@ -98,6 +106,10 @@ def display_sidebar_settings(on_refresh_callback=None):
     # Add refresh button
     if st.button("Refresh Data"):
         st.cache_data.clear()
+        # The on-disk FileCache outlives st.cache_data and would otherwise
+        # serve the same stale payload straight back within its TTL
+        clear_cached_time_series()
+        clear_cached_sentiment()
         if on_refresh_callback:
             on_refresh_callback()
 
@@ -174,18 +186,16 @@ def display_news_headlines(article_details, limit=5):
         ...     {'title': 'Negative News', 'url': 'http://example.com/2', 'source': 'News2', 'sentiment': -0.7},
         ...     {'title': 'Neutral News', 'url': 'http://example.com/3', 'source': 'News3', 'sentiment': 0.1}
         ... ]
-        >>> # Test function
+        >>> # All headlines render through a single batched markdown call
         >>> display_news_headlines(articles, limit=3)
         >>> len(markdown_calls)
-        3
-        >>> # Check if positive news has green color
+        1
+        >>> # The combined HTML carries each sentiment colour
         >>> 'green' in markdown_calls[0][0]
         True
-        >>> # Check if negative news has red color
-        >>> 'red' in markdown_calls[1][0]
+        >>> 'red' in markdown_calls[0][0]
         True
-        >>> # Check if neutral news has gray color
-        >>> 'gray' in markdown_calls[2][0]
+        >>> 'gray' in markdown_calls[0][0]
         True
         >>> # Test with fewer articles than the limit
         >>> markdown_calls.clear()
@@ -195,22 +205,35 @@ def display_news_headlines(article_details, limit=5):
     """
     st.header("Latest Business Headlines")
 
-    for article in article_details[:limit]:
-        if article['sentiment'] > 0.3:
-            color = "green"
-        elif article['sentiment'] < -0.3:
-            color = "red"
-        else:
-            color = "gray"
+    articles = article_details[:limit]
+    if not articles:
+        return
+
+    # One unpack into parallel field tuples, instead of four dict lookups
+    # per article spread across the colour pass and the HTML build
+    titles, urls, sources, sentiments = zip(
+        *((a['title'], a['url'], a['source'], a['sentiment']) for a in articles)
+    )
 
-        st.markdown(f"""
-        <a href='{article['url']}' style='text-decoration:none; color: inherit;'>
+    # Map every sentiment to its colour in one vectorized pass rather
+    # than branching per article in the interpreter
+    sents = np.array(sentiments)
+    colors = np.where(sents > 0.3, 'green', np.where(sents < -0.3, 'red', 'gray'))
+
+    # Each st.markdown is a separate frontend component and websocket
+    # message, so the cards are concatenated and rendered in one call
+    html_parts = [
+        f"""
+        <a href='{url}' style='text-decoration:none; color: inherit;'>
             <div style='padding:10px; margin:5px 0; border-left:4px solid {color}; background-color:#f5f5f5; color:#000;'>
-                <h4>{article['title']}</h4>
-                <p>{article['source']} | Sentiment: <span style='color:{color};'>{article['sentiment']:.2f}</span></p>
+                <h4>{title}</h4>
+                <p>{source} | Sentiment: <span style='color:{color};'>{sentiment:.2f}</span></p>
             </div>
         </a>
-        """, unsafe_allow_html=True)
+        """
+        for title, url, source, sentiment, color in zip(titles, urls, sources, sentiments, colors)
+    ]
+    st.markdown("\n".join(html_parts), unsafe_allow_html=True)
 
 def display_trade_dropdown(trades, value_mapping):
     """
@@ -276,48 +299,100 @@ def display_trade_dropdown(trades, value_mapping):
         >>> for name, func in original_functions.items():
         ...     setattr(st, name, func)
     """
-    filtered = []
-    for t in trades:
-        shares = t.get('shares', 0)
-        if shares == 0:
-            continue
-
-        sell_price = t.get('sell_price', t.get('price', 0))
-        if 'purchase_price' in t:
-            buy_price = t['purchase_price']
-        else:
-            pct = t.get('return_pct', 0) / 100.0
-            buy_price = sell_price / (1 + pct) if (1 + pct) != 0 else sell_price
-
-        profit_amt = (sell_price - buy_price) * shares
-        if abs(profit_amt) < 1e-8:
-            continue
-
-        pct_line = (profit_amt / (buy_price * shares) * 100) if (buy_price and shares) else 0.0
-        trade_dt = t['date']
-        portfolio_val = value_mapping.get(trade_dt, None)
-
-        filtered.append((t, buy_price, sell_price, shares, profit_amt, pct_line, portfolio_val))
+    # Picking a dropdown option reruns the whole script while the trade list
+    # itself is unchanged, so the filter + label pass is memoized in
+    # session_state and only redone when a new backtest produces a new list.
+    # The key uses content invariants (boundary dates plus last trade value,
+    # which scales with the portfolio input) — not id(), which CPython can
+    # recycle for a fresh list of the same length
+    if trades:
+        memo_key = (len(trades), trades[0]['date'], trades[-1]['date'], trades[-1].get('value'))
+    else:
+        memo_key = (0,)
+    if st.session_state.get('_trades_key') == memo_key:
+        filtered = st.session_state['_trades_filtered']
+        labels = st.session_state['_trades_labels']
+    else:
+        filtered = []
+        labels = []
+        if trades:
+            # P/L math as whole-column numpy ops instead of per-trade
+            # scalar arithmetic; missing keys become NaN columns to fill
+            df = pd.DataFrame(trades)
+            n = len(df)
+            shares = df['shares'].fillna(0).to_numpy() if 'shares' in df.columns else np.zeros(n)
+            price = df['price'].fillna(0.0).to_numpy(np.float64) if 'price' in df.columns else np.zeros(n)
+            if 'sell_price' in df.columns:
+                sell = df['sell_price'].fillna(pd.Series(price, index=df.index)).to_numpy(np.float64)
+            else:
+                sell = price
+            if 'return_pct' in df.columns:
+                pct = df['return_pct'].fillna(0.0).to_numpy(np.float64) / 100.0
+            else:
+                pct = np.zeros(n)
+
+            denom = 1.0 + pct
+            nonzero = denom != 0
+            buy = np.where(nonzero, sell / np.where(nonzero, denom, 1.0), sell)
+            if 'purchase_price' in df.columns:
+                has_pp = df['purchase_price'].notna().to_numpy()
+                buy = np.where(has_pp, df['purchase_price'].fillna(0.0).to_numpy(np.float64), buy)
+
+            profit = (sell - buy) * shares
+            base = buy * shares
+            pct_line = np.where(base != 0, profit / np.where(base != 0, base, 1.0) * 100.0, 0.0)
+            keep = (shares != 0) & (np.abs(profit) >= 1e-8)
+
+            # Format every timestamp in one C-level pass instead of a
+            # Python strftime call per trade
+            ts_l = pd.to_datetime(df['date']).dt.strftime('%Y-%m-%d %H:%M').tolist()
+
+            buy_l, sell_l = buy.tolist(), sell.tolist()
+            shares_l, profit_l, pct_l = shares.tolist(), profit.tolist(), pct_line.tolist()
+            for i in np.flatnonzero(keep).tolist():
+                t = trades[i]
+                filtered.append(
+                    (t, buy_l[i], sell_l[i], shares_l[i], profit_l[i], pct_l[i],
+                     value_mapping.get(t['date'], None))
+                )
+                labels.append(f"{ts_l[i]} — {t['symbol']} {t.get('action', '')} ({pct_l[i]:.2f}%)")
+
+        st.session_state['_trades_key'] = memo_key
+        st.session_state['_trades_filtered'] = filtered
+        st.session_state['_trades_labels'] = labels
 
     if not filtered:
         st.info("No trades with non‑zero P/L to display.")
         return
 
-    labels = []
-    for t, buy_price, sell_price, shares, profit_amt, pct_line, _ in filtered:
-        ts = t['date'].strftime('%Y-%m-%d %H:%M')
-        #  Use actual action if available
-        action = t.get('action', '')
-        if 'Take Profit' in action or 'Stop Loss' in action:
-            action_label = action
+    with st.expander("Non‑Zero P/L Trades", expanded=False):
+        # Streamlit still renders a collapsed expander's children, so an
+        # explicit toggle keeps the dropdown serialization and detail HTML
+        # off the common closed path entirely
+        if not st.checkbox("Show trade details", key="_show_trade_details"):
+            return
+
+        # A long backtest can emit thousands of trades, and the selectbox
+        # ships every option label to the frontend — pre-filter and cap the
+        # visible list so the dropdown stays cheap to render
+        search = st.text_input("Filter trades (symbol or date)")
+        if search:
+            needle = search.lower()
+            visible_idx = [i for i, label in enumerate(labels) if needle in label.lower()]
         else:
-            action_label = action  # fallback to original
-        labels.append(f"{ts} — {t['symbol']} {action_label} ({pct_line:.2f}%)")
+            visible_idx = list(range(len(labels)))
+
+        if len(visible_idx) > 200:
+            st.caption(f"Showing first 200 of {len(visible_idx)} matching trades — refine the filter to narrow down.")
+            visible_idx = visible_idx[:200]
+
+        if not visible_idx:
+            st.info("No trades match the filter.")
+            return
 
-    with st.expander("Non‑Zero P/L Trades", expanded=False):
         idx = st.selectbox(
             "Select a trade",
-            options=list(range(len(filtered))),
+            options=visible_idx,
             format_func=lambda i: labels[i]
         )
 
@@ -392,9 +467,15 @@ def setup_auto_refresh():
     auto_refresh = st.checkbox("Enable auto-refresh (every 30 seconds)")
 
     if auto_refresh:
-        st.markdown(
-            "<script>setTimeout(() => window.location.reload(), 30000);</script>",
-            unsafe_allow_html=True
-        )
+        if st_autorefresh is not None:
+            # Reruns the script in place instead of a hard page reload, so
+            # st.cache_data entries survive the tick and unchanged data is
+            # served from cache rather than refetched and redrawn
+            st_autorefresh(interval=30000, key="auto_refresh")
+        else:
+            st.markdown(
+                "<script>setTimeout(() => window.location.reload(), 30000);</script>",
+                unsafe_allow_html=True
+            )
 
     return auto_refresh
\ No newline at end of file
@@ -16,13 +16,18 @@ Key features:
 8. Current price & news-headline display components
 
 """
+from concurrent.futures import ThreadPoolExecutor
+
 import streamlit as st
+from modules.cache import df_fingerprint
 from modules.market_data import fetch_time_series, convert_to_dataframe, calculate_normalized_data
 from modules.sentiment import get_current_market_sentiment
 from modules.sentiment_trader import sentiment_strategy_backtest
 from modules.world_clock import display_world_clock, display_countdown_timer
 from datetime import datetime
+import numpy as np
 import pandas as pd
+import plotly.graph_objects as go
 from ui.charts import (
     create_price_chart,
     create_volume_chart,
@@ -37,6 +42,28 @@ from ui.components import (
 
 from config import PROFIT_TAKING, BULLISH_THRESHOLD, BEARISH_THRESHOLD, STOP_LOSS
 
+# O(1) frame fingerprint so the figure cache keys on content, not identity
+_FIG_HASH_FUNCS = {pd.DataFrame: df_fingerprint}
+
+
+@st.cache_data(ttl=60, show_spinner=False, hash_funcs=_FIG_HASH_FUNCS)
+def _build_strategy_fig(dates, sentiment_values, spy_df, gold_df, portfolio_value):
+    """Strategy-vs-benchmarks figure, rebuilt only when its inputs change"""
+    # Benchmarks as single ndarray multiplies — no intermediate Series,
+    # and plotly serializes numpy arrays directly
+    spy_close = spy_df['close'].to_numpy()
+    gold_close = gold_df['close'].to_numpy()
+    spy_bh = spy_close * (portfolio_value / spy_close[0])
+    gold_bh = gold_close * (portfolio_value / gold_close[0])
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=dates, y=sentiment_values, name="Sentiment Strategy"))
+    fig.add_trace(go.Scatter(x=spy_df['datetime'], y=spy_bh, name="Buy-and-Hold SPY"))
+    fig.add_trace(go.Scatter(x=gold_df['datetime'], y=gold_bh, name="Buy-and-Hold GLD"))
+    fig.update_layout(title="Strategy vs. Benchmarks", height=400)
+    return fig
+
+
 def create_streamlit_app():
     """
     Build and render the Streamlit Trading Dashboard.
@@ -130,8 +157,7 @@ def create_streamlit_app():
     )
 
     if st.sidebar.button(" Clear Session State (fully reset dashboard)"):
-        for key in list(st.session_state.keys()):
-            del st.session_state[key]
+        st.session_state.clear()
         st.rerun()
 
     with st.sidebar:
@@ -145,9 +171,16 @@ def create_streamlit_app():
         )
 
     with st.spinner("Fetching data..."):
-        spy_data = fetch_time_series('SPY', interval=interval, outputsize=outputsize)
-        gold_data = fetch_time_series('GLD', interval=interval, outputsize=outputsize)
-        sentiment_score, sentiment_summary, article_details = get_current_market_sentiment()
+        # Three independent HTTP calls — overlapping them makes the spinner
+        # last as long as the slowest fetch instead of the sum; cache hits
+        # still return immediately from inside the worker threads
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            f_spy = executor.submit(fetch_time_series, 'SPY', interval=interval, outputsize=outputsize)
+            f_gld = executor.submit(fetch_time_series, 'GLD', interval=interval, outputsize=outputsize)
+            f_sent = executor.submit(get_current_market_sentiment)
+            spy_data = f_spy.result()
+            gold_data = f_gld.result()
+            sentiment_score, sentiment_summary, article_details = f_sent.result()
         st.session_state['current_datetime'] = datetime.now()
 
     spy_df = convert_to_dataframe(spy_data)
@@ -181,9 +214,11 @@ def create_streamlit_app():
 
             with tab3:
                 st.subheader("Trading Volume")
-                if 'volume' in spy_df.columns:
+                # Only render when there is actual volume — an all-zero/NaN
+                # series still costs a full chart build and serialization
+                if 'volume' in spy_df.columns and spy_df['volume'].to_numpy().any():
                     st.plotly_chart(create_volume_chart(spy_df, 'SPY Volume'), use_container_width=True)
-                if 'volume' in gold_df.columns:
+                if 'volume' in gold_df.columns and gold_df['volume'].to_numpy().any():
                     st.plotly_chart(create_volume_chart(gold_df, 'GLD Volume'), use_container_width=True)
 
             with tab4:
@@ -204,33 +239,35 @@ def create_streamlit_app():
                 if sentiment_transactions:
                     df_trades = pd.DataFrame(sentiment_transactions)
 
-                    def highlight(row):
-                        if 'Take Profit' in row['action']:
-                            return ['background-color: #145A32; color: white'] * len(row)
-                        elif 'Stop Loss' in row['action']:
-                            return ['background-color: #922B21; color: white'] * len(row)
-                        return [''] * len(row)
+                    # Two vectorized action scans plus one whole-frame Styler
+                    # apply, instead of a Python highlight callback per row
+                    is_tp = df_trades['action'].str.contains('Take Profit', na=False).to_numpy()
+                    is_sl = df_trades['action'].str.contains('Stop Loss', na=False).to_numpy()
+                    styles = np.where(
+                        is_tp[:, None], 'background-color: #145A32; color: white',
+                        np.where(is_sl[:, None], 'background-color: #922B21; color: white', '')
+                    )
+                    # The masks produce an (n, 1) column; spread each row's
+                    # style across the full frame width for the Styler
+                    styles = np.broadcast_to(styles, df_trades.shape)
+                    style_df = pd.DataFrame(styles, index=df_trades.index, columns=df_trades.columns)
 
-                    st.dataframe(df_trades.style.apply(highlight, axis=1))
+                    st.dataframe(df_trades.style.apply(lambda _: style_df, axis=None))
                 else:
                     st.info(" No trades triggered.")
 
-                import plotly.graph_objects as go
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(x=dates, y=sentiment_values, name="Sentiment Strategy"))
-                fig.add_trace(go.Scatter(x=spy_df['datetime'], y=portfolio_value * spy_df['close'] / spy_df['close'].iloc[0], name="Buy-and-Hold SPY"))
-                fig.add_trace(go.Scatter(x=gold_df['datetime'], y=portfolio_value * gold_df['close'] / gold_df['close'].iloc[0], name="Buy-and-Hold GLD"))
-                fig.update_layout(title="Strategy vs. Benchmarks", height=400)
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(
+                    _build_strategy_fig(dates, sentiment_values, spy_df, gold_df, portfolio_value),
+                    use_container_width=True
+                )
 
-                value_mapping = {
-                    row['date']: val
-                    for row, val in zip(pd.DataFrame({'date': dates}).to_dict('records'), sentiment_values)
-                }
+                value_mapping = dict(zip(dates, sentiment_values))
 
                 display_trade_dropdown(sentiment_transactions, value_mapping)
                 st.header("Market Sentiment")
-                st.plotly_chart(create_sentiment_gauge(sentiment_score), use_container_width=True)
+                # Round to visible gauge resolution so tiny score jitter
+                # still lands in the same cached-figure bucket
+                st.plotly_chart(create_sentiment_gauge(round(sentiment_score, 3)), use_container_width=True)
                 st.subheader(sentiment_summary)
                 display_news_headlines(article_details)
 